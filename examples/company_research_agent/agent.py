@@ -8,12 +8,15 @@ Uses OpenRouter to support any model that supports tool calling.
 Switch models by changing the MODEL constant.
 """
 
+import asyncio
 import os
-import json
+from collections import defaultdict
 from pathlib import Path
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
-from tools_for_agents import GoogleSearchTool, WebFetchTool
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+from tools_for_agents import GoogleSearchTool, ToolCache, WebFetchTool
 
 # Load environment variables from .env file in this directory
 # .env should be in the same directory as this script
@@ -29,6 +32,143 @@ load_dotenv(Path(__file__).parent / ".env")
 
 DEFAULT_MODEL = "anthropic/claude-3.5-sonnet"
 
+# Batch mode talks to OpenAI directly (OpenRouter has no Batch API),
+# so it needs an OpenAI model name and OPENAI_API_KEY
+DEFAULT_BATCH_MODEL = "gpt-4o-mini"
+BATCH_POLL_SECONDS = 30
+BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Agent loop safety limit
+MAX_TURNS = 10
+
+# Send a backup search when SerpAPI hasn't answered after this many seconds
+# (each backup is a second paid search)
+SEARCH_HEDGE_AFTER = 1.2
+
+# Companies researched at once in realtime mode, to stay under provider rate limits
+MAX_CONCURRENT_COMPANIES = 4
+
+# Cap on tokens the model may generate per turn
+MAX_OUTPUT_TOKENS = 4096
+
+# History trimming - the whole conversation is resent every turn, so we keep
+# the latest tool results in full and shrink older, larger ones
+KEEP_LAST_TOOL_TURNS = 3
+MAX_TOOL_CHARS = 8000
+
+
+# System message for the agent
+SYSTEM_PROMPT = """You are a company research analyst. Your job is to research companies thoroughly using web search and content fetching.
+
+Your research workflow:
+1. Use google_search to find relevant pages about the company
+2. Use web_fetch to read the full content of the most relevant URLs (usually 2-3 key pages)
+3. Analyze the full content to extract detailed, accurate information
+
+For each company, gather:
+- General information (what they do, when founded, leadership)
+- Recent news and developments
+- Main products or services
+- Funding, revenue, or financial information
+
+After gathering information from actual web pages, compile a well-structured research report with clear sections and specific details."""
+
+
+# Sent once after the first search results, so the model skips web_fetch
+# when the snippets already answer the question
+SNIPPET_GATE_MESSAGE = {
+    "role": "system",
+    "content": (
+        "If the snippets already answer the user's question, produce the final "
+        "report now and do not call web_fetch."
+    )
+}
+
+
+def add_snippet_gate(messages: list[dict], tool_calls) -> None:
+    """
+    Append SNIPPET_GATE_MESSAGE after the first round that included a search.
+
+    Args:
+        messages: Conversation history (modified in place)
+        tool_calls: Tool calls from the turn that just ran
+    """
+    if SNIPPET_GATE_MESSAGE in messages:
+        return
+    if any(tc.function.name == "google_search" for tc in tool_calls):
+        messages.append(dict(SNIPPET_GATE_MESSAGE))
+
+
+def trim_messages(
+    messages: list[dict],
+    keep_last_tool_turns: int = KEEP_LAST_TOOL_TURNS,
+    max_tool_chars: int = MAX_TOOL_CHARS
+) -> list[dict]:
+    """
+    Shrink old tool results so the prompt stops growing with every turn.
+
+    Tool results from the last `keep_last_tool_turns` tool-calling turns are
+    kept as-is. Older results longer than `max_tool_chars` are replaced with a
+    short placeholder. Every message stays in place, so each tool call still
+    has its matching tool response.
+
+    Args:
+        messages: Conversation history
+        keep_last_tool_turns: Number of recent tool-calling turns kept in full
+        max_tool_chars: Older tool results above this size are truncated
+
+    Returns:
+        A new message list with old tool results compacted
+    """
+    tool_turns = [
+        idx for idx, msg in enumerate(messages)
+        if msg.get("role") == "assistant" and msg.get("tool_calls")
+    ]
+    if len(tool_turns) <= keep_last_tool_turns:
+        return messages
+
+    cutoff = tool_turns[-keep_last_tool_turns] if keep_last_tool_turns else len(messages)
+    trimmed = []
+    for idx, msg in enumerate(messages):
+        content = msg.get("content")
+        if (
+            idx < cutoff
+            and msg.get("role") == "tool"
+            and isinstance(content, str)
+            and len(content) > max_tool_chars
+        ):
+            msg = {**msg, "content": f"[truncated: {len(content)} chars from an earlier turn]"}
+        trimmed.append(msg)
+    return trimmed
+
+
+def tool_call_key(tool_call) -> bytes:
+    """
+    Build a key that matches tool calls asking for the same thing.
+
+    String arguments are whitespace-stripped and search queries are
+    lowercased (matching GoogleSearchTool's cache), so near-duplicate
+    calls share a key. Calls with unparseable arguments are never merged.
+
+    Args:
+        tool_call: Tool call emitted by the model
+
+    Returns:
+        Canonical key for the call
+    """
+    name = tool_call.function.name
+    try:
+        args = orjson.loads(tool_call.function.arguments)
+    except orjson.JSONDecodeError:
+        return tool_call.id.encode()
+
+    if isinstance(args, dict):
+        args = {k: v.strip() if isinstance(v, str) else v for k, v in args.items()}
+        if name == "google_search" and isinstance(args.get("query"), str):
+            args["query"] = args["query"].lower()
+
+    return orjson.dumps({"n": name, "a": args}, option=orjson.OPT_SORT_KEYS)
+
 
 class CompanyResearchAgent:
     """
@@ -47,7 +187,9 @@ class CompanyResearchAgent:
         self,
         model: str = DEFAULT_MODEL,
         openrouter_api_key: str | None = None,
-        serpapi_key: str | None = None
+        serpapi_key: str | None = None,
+        batch_model: str = DEFAULT_BATCH_MODEL,
+        openai_api_key: str | None = None
     ):
         """
         Initialize the research agent.
@@ -56,14 +198,26 @@ class CompanyResearchAgent:
             model: OpenRouter model to use (e.g., "anthropic/claude-3.5-sonnet")
             openrouter_api_key: OpenRouter API key (defaults to OPENROUTER_API_KEY env var)
             serpapi_key: SerpAPI key (defaults to SERPAPI_API_KEY env var)
+            batch_model: OpenAI model used by research_companies(mode="batch")
+            openai_api_key: OpenAI key for batch mode (defaults to OPENAI_API_KEY env var)
         """
         self.model = model
-        self.client = OpenAI(
+        self.client = AsyncOpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=openrouter_api_key or os.getenv("OPENROUTER_API_KEY"),
         )
-        self.search_tool = GoogleSearchTool(api_key=serpapi_key or os.getenv("SERPAPI_API_KEY"))
-        self.fetch_tool = WebFetchTool()
+        self.batch_model = batch_model
+        self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
+        # Created on first batch run so realtime use doesn't need an OpenAI key
+        self.batch_client: AsyncOpenAI | None = None
+        # Shared result cache - repeat searches and unchanged pages skip the download
+        self.cache = ToolCache()
+        self.search_tool = GoogleSearchTool(
+            api_key=serpapi_key or os.getenv("SERPAPI_API_KEY"),
+            cache=self.cache,
+            hedge_after=SEARCH_HEDGE_AFTER
+        )
+        self.fetch_tool = WebFetchTool(cache=self.cache)
 
         # Get tool schemas - OpenRouter uses OpenAI-compatible format
         self.tools = [
@@ -71,7 +225,7 @@ class CompanyResearchAgent:
             self.fetch_tool.to_openai_schema()
         ]
 
-    def research_company(self, company_name: str) -> str:
+    async def research_company(self, company_name: str) -> str:
         """
         Research a company and generate a comprehensive report.
 
@@ -85,41 +239,23 @@ class CompanyResearchAgent:
         print(f"🔍 Researching: {company_name}")
         print(f"{'='*60}\n")
 
-        # System message for the agent
-        system_prompt = """You are a company research analyst. Your job is to research companies thoroughly using web search and content fetching.
 
-Your research workflow:
-1. Use google_search to find relevant pages about the company
-2. Use web_fetch to read the full content of the most relevant URLs (usually 2-3 key pages)
-3. Analyze the full content to extract detailed, accurate information
-
-For each company, gather:
-- General information (what they do, when founded, leadership)
-- Recent news and developments
-- Main products or services
-- Funding, revenue, or financial information
-
-After gathering information from actual web pages, compile a well-structured research report with clear sections and specific details."""
-
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": f"Research {company_name} and create a comprehensive company report."
-            }
-        ]
+        messages = self._initial_messages(company_name, self.model)
 
         # Agent loop - continue until no more tool calls
         turn_count = 0
-        max_turns = 10  # Safety limit
+        max_turns = MAX_TURNS  # Safety limit
 
         while turn_count < max_turns:
             turn_count += 1
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 tools=self.tools,
+                tool_choice="auto",
+                parallel_tool_calls=True,
+                max_tokens=MAX_OUTPUT_TOKENS,
             )
 
             message = response.choices[0].message
@@ -131,90 +267,335 @@ After gathering information from actual web pages, compile a well-structured res
                 print("\n✓ Research complete\n")
                 return message.content
 
-            # Execute each tool call
-            for tool_call in message.tool_calls:
-                tool_name = tool_call.function.name
-                args = json.loads(tool_call.function.arguments)
-
-                try:
-                    if tool_name == "google_search":
-                        print(f"🔍 Searching: {args.get('query', '')}")
-                        result = self.search_tool.validate_and_execute(**args)
-                        print(f"   → Found {len(result.results)} results\n")
-
-                        # Format results for the model
-                        formatted_results = {
-                            "total_results": result.total_results,
-                            "results": [
-                                {
-                                    "position": r.position,
-                                    "title": r.title,
-                                    "url": r.url,
-                                    "snippet": r.snippet
-                                }
-                                for r in result.results
-                            ]
-                        }
-
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": json.dumps(formatted_results)
-                        })
-
-                    elif tool_name == "web_fetch":
-                        url = args.get('url', '')
-                        # Truncate long URLs for display
-                        display_url = url if len(url) < 50 else url[:47] + "..."
-                        print(f"📄 Fetching: {display_url}")
-
-                        result = self.fetch_tool.validate_and_execute(**args)
-                        content_preview = result.content[:100] + "..." if len(result.content) > 100 else result.content
-                        print(f"   → Got {len(result.content)} chars ({result.mode} mode)\n")
-
-                        # Format result for the model
-                        formatted_result = {
-                            "url": result.url,
-                            "title": result.title,
-                            "content": result.content,
-                            "mode": result.mode
-                        }
-
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": json.dumps(formatted_result)
-                        })
-
-                    else:
-                        print(f"   ✗ Unknown tool: {tool_name}")
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": json.dumps({"error": f"Unknown tool: {tool_name}"})
-                        })
-
-                except Exception as e:
-                    print(f"   ✗ Error: {e}")
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": json.dumps({"error": str(e)})
-                    })
+            messages.extend(await self._run_tool_calls(message.tool_calls))
+            add_snippet_gate(messages, message.tool_calls)
+            messages = trim_messages(messages)
 
         # Hit max turns
         print(f"\n⚠ Reached maximum turns ({max_turns})")
         return "Research incomplete - reached maximum turns"
 
+    async def research_companies(
+        self,
+        company_names: list[str],
+        mode: str = "realtime"
+    ) -> dict[str, str]:
+        """
+        Research several companies and return a report for each.
+
+        In "realtime" mode every company runs its own agent loop, up to
+        MAX_CONCURRENT_COMPANIES at a time. In "batch" mode each agent turn for all companies is submitted as one
+        OpenAI Batch API job (about half the price, but a job can take up to
+        24 hours). Tool calls still run locally between turns. In either mode
+        a company that fails gets a "Research failed: ..." report instead of
+        failing the others.
+
+        Args:
+            company_names: Names of the companies to research
+            mode: "realtime" or "batch"
+
+        Returns:
+            Reports keyed by company name
+        """
+        if mode == "realtime":
+            limit = asyncio.Semaphore(MAX_CONCURRENT_COMPANIES)
+            reports = await asyncio.gather(
+                *(self._research_company_limited(name, limit) for name in company_names)
+            )
+            return dict(zip(company_names, reports))
+        elif mode == "batch":
+            return await self._research_companies_batch(company_names)
+        else:
+            raise ValueError(f"Unknown mode: {mode!r} (use 'realtime' or 'batch')")
+
+    async def _research_company_limited(
+        self,
+        company_name: str,
+        limit: asyncio.Semaphore
+    ) -> str:
+        """
+        Research one company under a concurrency limit, reporting errors instead of raising.
+
+        Args:
+            company_name: Name of the company to research
+            limit: Semaphore shared by every company in the run
+
+        Returns:
+            The research report, or a "Research failed" note
+        """
+        async with limit:
+            try:
+                return await self.research_company(company_name)
+            except Exception as e:
+                print(f"✗ Research failed: {company_name}: {e}")
+                return f"Research failed: {e}"
+
+    async def _research_companies_batch(self, company_names: list[str]) -> dict[str, str]:
+        """
+        Run the agent loop for many companies, one Batch API job per turn.
+
+        Args:
+            company_names: Names of the companies to research
+
+        Returns:
+            Reports keyed by company name
+        """
+        if self.batch_client is None:
+            self.batch_client = AsyncOpenAI(api_key=self.openai_api_key)
+
+        # custom_id -> (company name, conversation) for companies still in progress
+        pending = {
+            f"company-{idx}": (name, self._initial_messages(name, self.batch_model))
+            for idx, name in enumerate(company_names)
+        }
+        reports = {}
+
+        for turn in range(1, MAX_TURNS + 1):
+            if not pending:
+                break
+
+            print(f"\n📦 Batch turn {turn}: submitting {len(pending)} requests")
+            rows, batch_error = await self._run_batch([
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.batch_model,
+                        "messages": messages,
+                        "tools": self.tools,
+                        "tool_choice": "auto",
+                        "parallel_tool_calls": True,
+                        "max_tokens": MAX_OUTPUT_TOKENS,
+                    }
+                }
+                for custom_id, (_, messages) in pending.items()
+            ])
+
+            tool_rounds = []
+            for custom_id, (name, messages) in list(pending.items()):
+                row = rows.get(custom_id)
+                response = row.get("response") if row else None
+                if not response or response.get("status_code") != 200:
+                    error = (row or {}).get("error") or (response or {}).get("body")
+                    reports[name] = f"Research failed: {error or batch_error or 'no batch result'}"
+                    del pending[custom_id]
+                    continue
+
+                message = ChatCompletion.model_validate(response["body"]).choices[0].message
+                messages.append(message.model_dump())
+
+                if not message.tool_calls:
+                    print(f"✓ Research complete: {name}")
+                    reports[name] = message.content
+                    del pending[custom_id]
+                else:
+                    tool_rounds.append((custom_id, message.tool_calls))
+
+            # Run every company's tool calls for this turn concurrently
+            results = await asyncio.gather(
+                *(self._run_tool_calls(tool_calls) for _, tool_calls in tool_rounds)
+            )
+            for (custom_id, tool_calls), tool_messages in zip(tool_rounds, results):
+                name, messages = pending[custom_id]
+                messages.extend(tool_messages)
+                add_snippet_gate(messages, tool_calls)
+                pending[custom_id] = (name, trim_messages(messages))
+
+        for name, _ in pending.values():
+            reports[name] = "Research incomplete - reached maximum turns"
+
+        return {name: reports[name] for name in company_names}
+
+    async def _run_batch(self, rows: list[dict]) -> tuple[dict[str, dict], str | None]:
+        """
+        Submit one Batch API job and wait for it to finish.
+
+        Args:
+            rows: Batch request rows (custom_id, method, url, body)
+
+        Returns:
+            Result rows keyed by custom_id (successes and per-request errors),
+            and the job-level error when the batch didn't complete
+        """
+        payload = b"\n".join(orjson.dumps(row) for row in rows)
+        batch_file = await self.batch_client.files.create(
+            file=("batch.jsonl", payload),
+            purpose="batch"
+        )
+        batch = await self.batch_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+
+        while batch.status not in BATCH_FINAL_STATUSES:
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            batch = await self.batch_client.batches.retrieve(batch.id)
+        print(f"   → Batch {batch.id} {batch.status}")
+
+        batch_error = None
+        if batch.status != "completed":
+            # e.g. a failed job reports why in batch.errors, with no per-request rows
+            errors = batch.errors.data if batch.errors and batch.errors.data else []
+            details = "; ".join(e.message or e.code or "unknown error" for e in errors)
+            batch_error = f"batch {batch.status}" + (f": {details}" if details else "")
+
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await self.batch_client.files.content(file_id)
+                for line in content.text.splitlines():
+                    if line.strip():
+                        row = orjson.loads(line)
+                        results[row["custom_id"]] = row
+        return results, batch_error
+
+    def _initial_messages(self, company_name: str, model: str) -> list[dict]:
+        """
+        Build the opening conversation for one company.
+
+        Args:
+            company_name: Name of the company to research
+            model: Model the conversation will be sent to
+
+        Returns:
+            System and user messages
+        """
+        return [
+            self._system_message(SYSTEM_PROMPT, model),
+            {
+                "role": "user",
+                "content": f"Research {company_name} and create a comprehensive company report."
+            }
+        ]
+
+    def _system_message(self, system_prompt: str, model: str) -> dict:
+        """
+        Build the system message, marking it cacheable where the provider supports it.
+
+        Anthropic models cache the prompt prefix up to a cache_control marker,
+        so the unchanged system prompt isn't re-processed every turn.
+
+        Args:
+            system_prompt: System prompt text
+            model: Model the message will be sent to
+
+        Returns:
+            A "system" role message
+        """
+        if not model.startswith("anthropic/"):
+            return {"role": "system", "content": system_prompt}
+
+        return {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+        }
+
+    async def aclose(self) -> None:
+        """Close the LLM client and the tools' HTTP clients."""
+        await self.client.close()
+        if self.batch_client is not None:
+            await self.batch_client.close()
+        await self.search_tool.aclose()
+        await self.fetch_tool.aclose()
+
+    async def _run_tool_calls(self, tool_calls) -> list[dict]:
+        """
+        Execute a turn's tool calls concurrently, running duplicates only once.
+
+        Args:
+            tool_calls: Tool calls emitted by the model in one turn
+
+        Returns:
+            One "tool" role message per call, in the model's order
+        """
+        groups = defaultdict(list)
+        for tool_call in tool_calls:
+            groups[tool_call_key(tool_call)].append(tool_call)
+
+        # Run one representative per group - gather keeps the order
+        contents = await asyncio.gather(
+            *(self._execute_tool_call(calls[0]) for calls in groups.values())
+        )
+
+        content_by_id = {}
+        for calls, content in zip(groups.values(), contents):
+            for tool_call in calls:
+                content_by_id[tool_call.id] = content
+
+        return [
+            {
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": content_by_id[tool_call.id]
+            }
+            for tool_call in tool_calls
+        ]
+
+    async def _execute_tool_call(self, tool_call) -> str:
+        """
+        Execute a single tool call.
+
+        Args:
+            tool_call: Tool call emitted by the model
+
+        Returns:
+            JSON content for the tool message (the result or an error)
+        """
+        tool_name = tool_call.function.name
+
+        try:
+            args = orjson.loads(tool_call.function.arguments)
+
+            if tool_name == "google_search":
+                print(f"🔍 Searching: {args.get('query', '')}")
+                result = await self.search_tool.validate_and_execute_async(**args)
+                print(f"   → Found {len(result.results)} results\n")
+
+                # Serialize straight from the output model - no intermediate dict
+                content = result.model_dump_json()
+
+            elif tool_name == "web_fetch":
+                url = args.get('url', '')
+                # Truncate long URLs for display
+                display_url = url if len(url) < 50 else url[:47] + "..."
+                print(f"📄 Fetching: {display_url}")
+
+                result = await self.fetch_tool.validate_and_execute_async(**args)
+                print(f"   → Got {len(result.content)} chars ({result.mode} mode)\n")
+
+                # Serialize straight from the output model - no intermediate dict
+                content = result.model_dump_json()
+
+            else:
+                print(f"   ✗ Unknown tool: {tool_name}")
+                content = orjson.dumps({"error": f"Unknown tool: {tool_name}"}).decode()
+
+        except Exception as e:
+            print(f"   ✗ Error: {e}")
+            content = orjson.dumps({"error": str(e)}).decode()
+
+        return content
+
 
-def main():
+async def main():
     """Run the company research agent."""
     # Customize these variables
     company_to_research = "VIA Science"
     model = DEFAULT_MODEL  # Change to any model from https://openrouter.ai/models
 
     agent = CompanyResearchAgent(model=model)
-    report = agent.research_company(company_to_research)
+    try:
+        report = await agent.research_company(company_to_research)
+    finally:
+        await agent.aclose()
 
     print("="*60)
     print("📊 REPORT")
@@ -224,4 +605,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,6 +1,7 @@
 """Tools for Agents - Runtime tools for LLM agents."""
 
 from .base import BaseTool
+from .cache import ToolCache
 from .exceptions import (
     ToolExecutionError,
     AuthenticationError,
@@ -13,6 +14,7 @@ __version__ = "0.1.0"
 
 __all__ = [
     "BaseTool",
+    "ToolCache",
     "ToolExecutionError",
     "AuthenticationError",
     "RateLimitError",
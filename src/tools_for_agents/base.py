@@ -1,5 +1,8 @@
 """Base class for all tools."""
 
+import asyncio
+import copy
+import functools
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar
 from pydantic import BaseModel
@@ -10,12 +13,24 @@ InputT = TypeVar("InputT", bound=BaseModel)
 OutputT = TypeVar("OutputT", bound=BaseModel)
 
 
+@functools.lru_cache(maxsize=None)
+def _json_schema_for(model_cls: type[BaseModel]) -> dict:
+    """Build a model's JSON schema once per class."""
+    return model_cls.model_json_schema()
+
+
+def _parameters_schema(model_cls: type[BaseModel]) -> dict:
+    """Return a private copy of the cached schema so callers can't mutate the cache."""
+    return copy.deepcopy(_json_schema_for(model_cls))
+
+
 class BaseTool(ABC, Generic[InputT, OutputT]):
     """
     Base class for all tools.
 
     Tools provide discrete, composable operations for LLM agents.
-    Contributors implement the execute() method with their tool logic.
+    Contributors implement the execute() method with their tool logic,
+    and may override execute_async() with a native async version.
 
     Attributes:
         name: The tool's unique identifier
@@ -62,6 +77,42 @@ class BaseTool(ABC, Generic[InputT, OutputT]):
         result = self.execute(validated_input)
         return result
 
+    async def execute_async(self, input: InputT) -> OutputT:
+        """
+        Execute the tool without blocking the event loop.
+
+        The default runs execute() in a worker thread. Tools with an async
+        HTTP client override this to await their requests directly.
+
+        Args:
+            input: Validated input conforming to input_model
+
+        Returns:
+            Output conforming to output_model
+
+        Raises:
+            ToolExecutionError: If tool execution fails
+        """
+        return await asyncio.to_thread(self.execute, input)
+
+    async def validate_and_execute_async(self, **kwargs) -> OutputT:
+        """
+        Async public interface: validates input, executes, returns validated output.
+
+        Args:
+            **kwargs: Raw input arguments to be validated
+
+        Returns:
+            Validated output from tool execution
+        """
+        validated_input = self.input_model(**kwargs)
+        result = await self.execute_async(validated_input)
+        return result
+
+    async def aclose(self) -> None:
+        """Release async resources (e.g. HTTP clients). No-op by default."""
+        pass
+
     def to_openai_schema(self) -> dict:
         """
         Generate OpenAI function calling schema.
@@ -74,7 +125,7 @@ class BaseTool(ABC, Generic[InputT, OutputT]):
             "function": {
                 "name": self.name,
                 "description": self.description,
-                "parameters": self.input_model.model_json_schema(),
+                "parameters": _parameters_schema(self.input_model),
             }
         }
 
@@ -88,5 +139,5 @@ class BaseTool(ABC, Generic[InputT, OutputT]):
         return {
             "name": self.name,
             "description": self.description,
-            "input_schema": self.input_model.model_json_schema()
+            "input_schema": _parameters_schema(self.input_model)
         }
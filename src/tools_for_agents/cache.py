@@ -0,0 +1,128 @@
+"""Result cache shared by tools."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import diskcache
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".tools_for_agents" / "cache"
+
+
+class ToolCache:
+    """
+    Two-level cache for tool results: in-memory LRU in front of an on-disk store.
+
+    Values are strings (tools store serialized output models). Each entry
+    carries its own TTL, so tools with different freshness needs can share
+    one cache. The disk level persists across runs; pass directory=None to
+    keep everything in memory.
+
+    Example:
+        >>> cache = ToolCache()
+        >>> search = GoogleSearchTool(api_key="your-key", cache=cache, ttl=3600)
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = DEFAULT_CACHE_DIR,
+        max_memory_items: int = 1024,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory for the on-disk store. None disables disk persistence.
+            max_memory_items: Maximum number of entries kept in memory
+        """
+        self.max_memory_items = max_memory_items
+        self._memory: OrderedDict[str, tuple[float | None, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = diskcache.Cache(str(Path(directory).expanduser())) if directory else None
+
+    @staticmethod
+    def make_key(tool: str, **params) -> str:
+        """
+        Build a stable cache key from a tool name and its parameters.
+
+        Args:
+            tool: Tool name, so different tools never collide
+            **params: JSON-serializable parameters that identify the call
+
+        Returns:
+            Hex digest identifying the call
+        """
+        payload = json.dumps({"tool": tool, **params}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a value, checking memory first and then disk.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.time():
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+
+        if self._disk is None:
+            return None
+
+        value, expires_at = self._disk.get(key, default=None, expire_time=True)
+        if value is not None:
+            self._remember(key, value, expires_at)
+        return value
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        """
+        Store a value in memory and on disk.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires. None keeps it until evicted.
+        """
+        expires_at = time.time() + ttl if ttl is not None else None
+        self._remember(key, value, expires_at)
+        if self._disk is not None:
+            self._disk.set(key, value, expire=ttl)
+
+    def delete(self, key: str) -> None:
+        """
+        Remove a value from both cache levels.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._memory.pop(key, None)
+        if self._disk is not None:
+            self._disk.delete(key)
+
+    def clear(self) -> None:
+        """Remove every entry from both cache levels."""
+        with self._lock:
+            self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def _remember(self, key: str, value: str, expires_at: float | None) -> None:
+        """Insert into the memory level, evicting the least recently used entry."""
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
@@ -0,0 +1,159 @@
+"""Pooled HTTP sessions shared by tools."""
+
+import asyncio
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Transient statuses worth retrying with backoff
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# Shared retry policy for the sync and async clients
+DEFAULT_MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+
+# Longest Retry-After we'll wait, so a server can't stall a call for hours
+MAX_RETRY_AFTER = 5
+
+
+class CappedRetry(Retry):
+    """urllib3 Retry that waits at most MAX_RETRY_AFTER seconds between attempts."""
+
+    def get_retry_after(self, response) -> float | None:
+        retry_after = super().get_retry_after(response)
+        return min(retry_after, MAX_RETRY_AFTER) if retry_after is not None else None
+
+
+def create_session(
+    pool_connections: int = 8,
+    pool_maxsize: int = 8,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_statuses: bool = True,
+) -> requests.Session:
+    """
+    Create a requests session with connection pooling and retries.
+
+    Reusing one session keeps TCP/TLS connections alive between calls.
+    Connection errors are retried with backoff, and so are transient
+    statuses unless retry_statuses is False; once retries run out the last
+    response is returned as-is, so callers still see it through
+    raise_for_status(). Read timeouts are never retried, so a server that
+    hangs costs one timeout rather than one per attempt.
+
+    The session rejects all cookies, so one call can't change what a
+    later call gets back.
+
+    Args:
+        pool_connections: Number of hosts to keep connection pools for
+        pool_maxsize: Maximum connections kept per host
+        max_retries: Retries for connection errors and transient statuses
+        retry_statuses: Whether to retry the statuses in RETRY_STATUSES
+
+    Returns:
+        A configured requests session
+    """
+    retry = CappedRetry(
+        total=max_retries,
+        read=0,
+        status=max_retries if retry_statuses else 0,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class StatusRetryTransport(httpx.AsyncBaseTransport):
+    """
+    Retry transient statuses with backoff, matching the sync session's Retry.
+
+    httpx only retries failed connections, so this wraps a transport and
+    re-sends requests that come back with a status in RETRY_STATUSES. A
+    numeric Retry-After header is honored up to MAX_RETRY_AFTER seconds.
+    Retries also stop once waiting would run past the request's read
+    timeout. Either way the last response is returned as-is.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_retries: int):
+        self._transport = transport
+        self.max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        loop = asyncio.get_running_loop()
+        budget = request.extensions.get("timeout", {}).get("read")
+        deadline = loop.time() + budget if budget is not None else None
+
+        for attempt in range(self.max_retries + 1):
+            response = await self._transport.handle_async_request(request)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(int(retry_after), MAX_RETRY_AFTER)
+            else:
+                # Same schedule as urllib3: no wait before the first retry
+                delay = BACKOFF_FACTOR * (2 ** attempt) if attempt else 0
+            if deadline is not None and loop.time() + delay >= deadline:
+                return response
+
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_async_client(
+    max_keepalive_connections: int = 32,
+    max_connections: int = 64,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_statuses: bool = True,
+) -> httpx.AsyncClient:
+    """
+    Create an async HTTP client with HTTP/2, connection pooling, and retries.
+
+    HTTP/2 lets concurrent requests to the same host share one connection.
+    Connection errors and (unless retry_statuses is False) transient
+    statuses are retried like the sync session, and the last response is
+    returned once retries run out. Like the sync session, it keeps no
+    cookies between calls.
+
+    Args:
+        max_keepalive_connections: Idle connections kept open for reuse
+        max_connections: Maximum concurrent connections
+        max_retries: Retries for connection errors and transient statuses
+        retry_statuses: Whether to retry the statuses in RETRY_STATUSES
+
+    Returns:
+        A configured httpx async client that follows redirects
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=max_retries,
+        limits=httpx.Limits(
+            max_keepalive_connections=max_keepalive_connections,
+            max_connections=max_connections,
+        ),
+    )
+    if retry_statuses:
+        transport = StatusRetryTransport(transport, max_retries)
+    return httpx.AsyncClient(
+        transport=transport,
+        cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+        follow_redirects=True
+    )
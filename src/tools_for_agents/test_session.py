@@ -0,0 +1,151 @@
+"""Tests for the shared HTTP clients."""
+
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from tools_for_agents import session
+from tools_for_agents.session import StatusRetryTransport, create_session
+
+
+class CountingServer(ThreadingHTTPServer):
+    """Local server that answers every GET with one status and counts requests."""
+
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.calls = 0
+        super().__init__(("127.0.0.1", 0), CountingHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.calls += 1
+        self.send_response(self.server.status)
+        for name, value in self.server.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(status, headers=None):
+        server = CountingServer(status, headers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_sync_caps_retry_after(monkeypatch, serve):
+    monkeypatch.setattr(session, "MAX_RETRY_AFTER", 0.01)
+    server = serve(503, {"Retry-After": "3600"})
+    response = create_session().get(server.url, timeout=5)
+    assert response.status_code == 503
+    assert server.calls == 4
+
+
+def test_sync_can_skip_status_retries(serve):
+    server = serve(503, {"Retry-After": "1"})
+    response = create_session(retry_statuses=False).get(server.url, timeout=5)
+    assert response.status_code == 503
+    assert server.calls == 1
+
+
+def test_sync_does_not_retry_read_timeouts():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    url = f"http://127.0.0.1:{listener.getsockname()[1]}/"
+    try:
+        with pytest.raises(requests.RequestException):
+            create_session().get(url, timeout=0.2)
+        # Only one connection was accepted into the backlog
+        listener.settimeout(0.1)
+        listener.accept()[0].close()
+        with pytest.raises(socket.timeout):
+            listener.accept()
+    finally:
+        listener.close()
+
+
+def test_sync_rejects_cookies(serve):
+    server = serve(200, {"Set-Cookie": "seen=1; Path=/"})
+    http = create_session()
+    http.get(server.url, timeout=5)
+    assert len(http.cookies) == 0
+
+
+class SequenceTransport(httpx.AsyncBaseTransport):
+    """Transport that answers with a fixed sequence of statuses."""
+
+    def __init__(self, statuses, headers=None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+
+    async def handle_async_request(self, request):
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        return httpx.Response(status, headers=self.headers, request=request)
+
+
+def get(transport, max_retries, timeout=5):
+    async def run():
+        client = httpx.AsyncClient(transport=StatusRetryTransport(transport, max_retries))
+        async with client:
+            return await client.get("https://example.com/", timeout=timeout)
+    return asyncio.run(run())
+
+
+def test_async_retries_transient_statuses(monkeypatch):
+    monkeypatch.setattr(session, "BACKOFF_FACTOR", 0)
+    transport = SequenceTransport([429, 503, 200])
+    assert get(transport, max_retries=3).status_code == 200
+    assert transport.calls == 3
+
+
+def test_async_returns_last_response_when_retries_run_out(monkeypatch):
+    monkeypatch.setattr(session, "BACKOFF_FACTOR", 0)
+    transport = SequenceTransport([429])
+    assert get(transport, max_retries=3).status_code == 429
+    assert transport.calls == 4
+
+
+def test_async_does_not_retry_other_errors():
+    transport = SequenceTransport([401])
+    assert get(transport, max_retries=3).status_code == 401
+    assert transport.calls == 1
+
+
+def test_async_caps_retry_after(monkeypatch):
+    monkeypatch.setattr(session, "MAX_RETRY_AFTER", 0.01)
+    transport = SequenceTransport([503], {"Retry-After": "3600"})
+    assert get(transport, max_retries=3).status_code == 503
+    assert transport.calls == 4
+
+
+def test_async_stops_retrying_at_the_timeout():
+    # MAX_RETRY_AFTER (5s) would outlast the 1s timeout, so give up right away
+    transport = SequenceTransport([503], {"Retry-After": "10"})
+    assert get(transport, max_retries=3, timeout=1).status_code == 503
+    assert transport.calls == 1
@@ -1,12 +1,28 @@
 """Google Search tool using SerpAPI."""
 
+import asyncio
 import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import List
+import httpx
 import requests
 from pydantic import BaseModel, Field
 
 from ...base import BaseTool
+from ...cache import ToolCache
 from ...exceptions import AuthenticationError, RateLimitError, ToolExecutionError
+from ...session import (
+    DEFAULT_MAX_RETRIES,
+    RETRY_STATUSES,
+    create_async_client,
+    create_session,
+)
+
+
+SERPAPI_URL = "https://serpapi.com/search"
+
+# Threads shared by a tool's hedged searches (two per search in flight)
+HEDGE_WORKERS = 8
 
 
 class GoogleSearchInput(BaseModel):
@@ -67,12 +83,23 @@ class GoogleSearchTool(BaseTool[GoogleSearchInput, GoogleSearchOutput]):
     input_model = GoogleSearchInput
     output_model = GoogleSearchOutput
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: ToolCache | None = None,
+        ttl: int = 86400,
+        hedge_after: float | None = None
+    ):
         """
         Initialize the Google Search tool.
 
         Args:
             api_key: SerpAPI API key. If not provided, will use SERPAPI_API_KEY env var.
+            cache: Optional cache for search results. Repeat queries skip SerpAPI.
+            ttl: Seconds a cached result stays fresh (default: 1 day)
+            hedge_after: If a search takes longer than this many seconds, send a
+                second identical request and use whichever answers first. Each
+                backup is a second paid search. None (the default) disables hedging.
 
         Raises:
             ValueError: If no API key is provided
@@ -82,6 +109,24 @@ class GoogleSearchTool(BaseTool[GoogleSearchInput, GoogleSearchOutput]):
             raise ValueError(
                 "SERPAPI_API_KEY is required. Get one at https://serpapi.com/"
             )
+        self.cache = cache
+        self.ttl = ttl
+        self.hedge_after = hedge_after
+        # With hedging, the first attempt goes out on clients that don't retry,
+        # and the retrying clients only get the remaining attempts
+        self._retries = DEFAULT_MAX_RETRIES if hedge_after is None else DEFAULT_MAX_RETRIES - 1
+        # Pooled session - reuses the SerpAPI connection and retries transient errors
+        self._session = create_session(max_retries=self._retries)
+        self._hedge_session = None
+        self._executor = None
+        if hedge_after is not None:
+            self._hedge_session = create_session(max_retries=0)
+            self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS)
+        # httpx clients can't be reused across event loops, so the async clients
+        # are created on first use and rebuilt when the running loop changes
+        self._aclient: httpx.AsyncClient | None = None
+        self._ahedge_client: httpx.AsyncClient | None = None
+        self._aclient_loop: asyncio.AbstractEventLoop | None = None
 
     def execute(self, input: GoogleSearchInput) -> GoogleSearchOutput:
         """
@@ -98,62 +143,262 @@ class GoogleSearchTool(BaseTool[GoogleSearchInput, GoogleSearchOutput]):
             RateLimitError: If API rate limit is exceeded
             ToolExecutionError: If search fails for other reasons
         """
+        cache_key, cached = self._lookup(input)
+        if cached is not None:
+            return cached
+
         try:
-            params = {
-                "q": input.query,
-                "num": input.num_results,
-                "api_key": self.api_key,
-                "engine": "google"
-            }
-
-            response = requests.get(
-                "https://serpapi.com/search",
-                params=params,
-                timeout=30
-            )
+            response = self._hedged_get(self._params(input))
             response.raise_for_status()
-            data = response.json()
-
-            # Check for API errors
-            if "error" in data:
-                error_msg = data["error"]
-                if "Invalid API key" in error_msg:
-                    raise AuthenticationError(f"Invalid SerpAPI key: {error_msg}")
-                else:
-                    raise ToolExecutionError(f"SerpAPI error: {error_msg}")
-
-            # Transform to standard format
-            results = []
-            organic_results = data.get("organic_results", [])
-
-            for idx, item in enumerate(organic_results[:input.num_results]):
-                results.append(
-                    SearchResult(
-                        title=item.get("title", ""),
-                        url=item.get("link", ""),
-                        snippet=item.get("snippet", ""),
-                        position=idx + 1
-                    )
-                )
-
-            total = data.get("search_information", {}).get("total_results", 0)
-            # Handle string total_results
-            if isinstance(total, str):
-                total = int(total.replace(",", ""))
-
-            return GoogleSearchOutput(
-                results=results,
-                total_results=total
-            )
+            output = self._parse(response.json(), input)
 
         except requests.HTTPError as e:
-            if e.response.status_code == 429:
-                raise RateLimitError("SerpAPI rate limit exceeded") from e
-            elif e.response.status_code == 401:
-                raise AuthenticationError("Invalid SerpAPI key") from e
-            else:
-                raise ToolExecutionError(f"HTTP error: {e}") from e
+            raise self._status_error(e.response.status_code, e) from e
         except requests.RequestException as e:
             raise ToolExecutionError(f"Request failed: {e}") from e
-        except (KeyError, ValueError) as e:
+        except (KeyError, TypeError, ValueError) as e:
             raise ToolExecutionError(f"Failed to parse response: {e}") from e
+
+        self._store(cache_key, output)
+        return output
+
+    async def execute_async(self, input: GoogleSearchInput) -> GoogleSearchOutput:
+        """
+        Execute Google search via SerpAPI without blocking the event loop.
+
+        Args:
+            input: Validated search parameters
+
+        Returns:
+            Structured search results
+
+        Raises:
+            AuthenticationError: If API key is invalid
+            RateLimitError: If API rate limit is exceeded
+            ToolExecutionError: If search fails for other reasons
+        """
+        cache_key, cached = self._lookup(input)
+        if cached is not None:
+            return cached
+
+        self._open_async_clients()
+
+        try:
+            response = await self._hedged_get_async(self._params(input))
+            response.raise_for_status()
+            output = self._parse(response.json(), input)
+
+        except httpx.HTTPStatusError as e:
+            raise self._status_error(e.response.status_code, e) from e
+        except httpx.HTTPError as e:
+            raise ToolExecutionError(f"Request failed: {e}") from e
+        except (KeyError, TypeError, ValueError) as e:
+            raise ToolExecutionError(f"Failed to parse response: {e}") from e
+
+        self._store(cache_key, output)
+        return output
+
+    async def aclose(self) -> None:
+        """Close the async HTTP clients, if they were opened on the running event loop."""
+        if self._aclient_loop is asyncio.get_running_loop():
+            for client in (self._aclient, self._ahedge_client):
+                if client is not None:
+                    await client.aclose()
+        self._aclient = None
+        self._ahedge_client = None
+        self._aclient_loop = None
+
+    def _open_async_clients(self) -> None:
+        """Create the async clients for the running event loop, if needed."""
+        loop = asyncio.get_running_loop()
+        if self._aclient is not None and self._aclient_loop is loop:
+            return
+
+        # Clients from an earlier loop can't be closed from this one - drop them
+        self._aclient = create_async_client(max_retries=self._retries)
+        self._ahedge_client = (
+            create_async_client(max_retries=0) if self.hedge_after is not None else None
+        )
+        self._aclient_loop = loop
+
+    def _hedged_get(self, params: dict) -> requests.Response:
+        """
+        Send a search, hedging the first attempt with a backup if it's slow.
+
+        Searches are idempotent GETs, so a duplicate is safe. Hedged sends don't
+        retry on their own. If neither returns a usable response, the retrying
+        session makes the remaining attempts, so the total stays the same as
+        without hedging.
+        """
+        if self.hedge_after is None:
+            return self._session.get(SERPAPI_URL, params=params, timeout=30)
+
+        response = self._race(params)
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return response
+        if response is not None:
+            response.close()
+        return self._session.get(SERPAPI_URL, params=params, timeout=30)
+
+    def _race(self, params: dict) -> requests.Response | None:
+        """
+        Run the hedged first attempt.
+
+        Returns:
+            The first successful response, else the first response we got
+            (e.g. a 401 or 429), or None if both requests raised
+        """
+        futures = [self._submit(params)]
+        done, _ = wait(futures, timeout=self.hedge_after)
+        if not done:
+            futures.append(self._submit(params))
+
+        winner = None
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if _succeeded(f)), None)
+        if winner is None:
+            # Neither succeeded - fall back to the first response we got
+            winner = next((f for f in futures if f.exception() is None), None)
+
+        # Don't wait on the other request - close its connection when it finishes
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(_close_response)
+        return winner.result() if winner is not None else None
+
+    def _submit(self, params: dict) -> Future:
+        """Start one non-retrying search request in the shared executor."""
+        return self._executor.submit(
+            self._hedge_session.get, SERPAPI_URL, params=params, timeout=30
+        )
+
+    async def _hedged_get_async(self, params: dict) -> httpx.Response:
+        """Async version of _hedged_get - the losing request is cancelled."""
+        if self.hedge_after is None:
+            return await self._aclient.get(SERPAPI_URL, params=params, timeout=30)
+
+        response = await self._race_async(params)
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return response
+        return await self._aclient.get(SERPAPI_URL, params=params, timeout=30)
+
+    async def _race_async(self, params: dict) -> httpx.Response | None:
+        """Async version of _race."""
+        tasks = [asyncio.create_task(
+            self._ahedge_client.get(SERPAPI_URL, params=params, timeout=30)
+        )]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if not done:
+                tasks.append(asyncio.create_task(
+                    self._ahedge_client.get(SERPAPI_URL, params=params, timeout=30)
+                ))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                succeeded = [t for t in done if _succeeded(t)]
+                if succeeded:
+                    return succeeded[0].result()
+
+            # Neither succeeded - fall back to the first response we got
+            return next((t.result() for t in tasks if t.exception() is None), None)
+        finally:
+            # Also covers cancellation while we wait on the first attempt
+            for task in tasks:
+                task.cancel()
+
+    def _lookup(
+        self, input: GoogleSearchInput
+    ) -> tuple[str | None, GoogleSearchOutput | None]:
+        """Return the cache key for this search and the cached output, if any."""
+        if self.cache is None:
+            return None, None
+
+        cache_key = ToolCache.make_key(
+            self.name,
+            q=input.query.strip().lower(),
+            n=input.num_results
+        )
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+        return cache_key, GoogleSearchOutput.model_validate_json(cached)
+
+    def _store(self, cache_key: str | None, output: GoogleSearchOutput) -> None:
+        """Save a fresh search result to the cache."""
+        if cache_key is not None:
+            self.cache.set(cache_key, output.model_dump_json(), ttl=self.ttl)
+
+    def _params(self, input: GoogleSearchInput) -> dict:
+        """Build SerpAPI query parameters."""
+        return {
+            "q": input.query,
+            "num": input.num_results,
+            "api_key": self.api_key,
+            "engine": "google"
+        }
+
+    def _parse(self, data: dict, input: GoogleSearchInput) -> GoogleSearchOutput:
+        """Transform a SerpAPI response body into our output model."""
+        # Check for API errors
+        if "error" in data:
+            error_msg = data["error"]
+            if "Invalid API key" in error_msg:
+                raise AuthenticationError(f"Invalid SerpAPI key: {error_msg}")
+            else:
+                raise ToolExecutionError(f"SerpAPI error: {error_msg}")
+
+        # Transform to standard format. We build every field ourselves with the
+        # right type, so model_construct skips re-validating each result.
+        results = []
+        organic_results = data.get("organic_results", [])
+
+        for idx, item in enumerate(organic_results[:input.num_results]):
+            results.append(
+                SearchResult.model_construct(
+                    title=item.get("title") or "",
+                    url=item.get("link") or "",
+                    snippet=item.get("snippet") or "",
+                    position=idx + 1
+                )
+            )
+
+        # SerpAPI may omit total_results or send null
+        total = (data.get("search_information") or {}).get("total_results") or 0
+        # Handle string total_results
+        if isinstance(total, str):
+            total = int(total.replace(",", ""))
+
+        return GoogleSearchOutput.model_construct(
+            results=results,
+            total_results=int(total)
+        )
+
+    def _status_error(self, status_code: int, error: Exception) -> ToolExecutionError:
+        """Map an HTTP error status to one of our exceptions."""
+        if status_code == 429:
+            return RateLimitError("SerpAPI rate limit exceeded")
+        elif status_code == 401:
+            return AuthenticationError("Invalid SerpAPI key")
+        else:
+            return ToolExecutionError(f"HTTP error: {error}")
+
+
+def _succeeded(future: Future | asyncio.Task) -> bool:
+    """Whether a finished hedged request returned a non-error response."""
+    return (
+        not future.cancelled()
+        and future.exception() is None
+        and future.result().status_code < 400
+    )
+
+
+def _close_response(future: Future) -> None:
+    """Release the connection held by a hedged request we didn't use."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
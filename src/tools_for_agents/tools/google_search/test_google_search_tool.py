@@ -0,0 +1,137 @@
+"""Tests for GoogleSearchTool."""
+
+import asyncio
+import time
+
+import pytest
+
+from tools_for_agents import GoogleSearchTool, ToolExecutionError
+
+
+class FakeResponse:
+    """Minimal stand-in for a requests.Response with a JSON body."""
+
+    def __init__(self, data, status_code: int = 200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Session that always returns the same SerpAPI body."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.data)
+
+
+def search(data):
+    tool = GoogleSearchTool(api_key="test-key", hedge_after=None)
+    tool._session = FakeSession(data)
+    return tool.validate_and_execute(query="acme", num_results=2)
+
+
+def test_results_are_transformed():
+    result = search({
+        "organic_results": [
+            {"title": "Acme", "link": "https://acme.com", "snippet": "Widgets"},
+            {"title": "Acme News", "link": "https://news.acme.com", "snippet": None},
+            {"title": "Extra", "link": "https://extra.com", "snippet": "Dropped"},
+        ],
+        "search_information": {"total_results": "1,234"},
+    })
+    assert [(r.position, r.title, r.snippet) for r in result.results] == [
+        (1, "Acme", "Widgets"),
+        (2, "Acme News", ""),
+    ]
+    assert result.total_results == 1234
+
+
+@pytest.mark.parametrize("info", [{"total_results": None}, {}, None])
+def test_missing_total_results_defaults_to_zero(info):
+    result = search({"organic_results": [], "search_information": info})
+    assert result.total_results == 0
+
+
+def test_malformed_total_results_raises_tool_error():
+    with pytest.raises(ToolExecutionError):
+        search({"organic_results": [], "search_information": {"total_results": [1]}})
+
+
+class ScriptedSession:
+    """Session whose nth call sleeps, then returns the nth scripted status."""
+
+    def __init__(self, script):
+        self.script = script
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        delay, status = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        time.sleep(delay)
+        return FakeResponse({"organic_results": [], "search_information": {}}, status)
+
+
+def hedged_tool(hedge_script, retry_script=((0, 200),)):
+    tool = GoogleSearchTool(api_key="test-key", hedge_after=0.05)
+    tool._hedge_session = ScriptedSession(hedge_script)
+    tool._session = ScriptedSession(retry_script)
+    return tool
+
+
+def test_hedge_prefers_slow_success_over_fast_error():
+    tool = hedged_tool([(0.2, 200), (0, 500)])
+    assert tool._hedged_get({}).status_code == 200
+    assert tool._session.calls == 0
+
+
+def test_hedging_is_off_by_default():
+    tool = GoogleSearchTool(api_key="test-key")
+    tool._session = ScriptedSession([(0.1, 200)])
+    assert tool._hedged_get({}).status_code == 200
+    assert tool._hedge_session is None
+    assert tool._session.calls == 1
+
+
+def test_rate_limited_search_is_not_hedged_twice():
+    tool = hedged_tool([(0, 429)], retry_script=[(0, 429)])
+    assert tool._hedged_get({}).status_code == 429
+    # One hedged attempt (no backup, it answered quickly), then one retrying send
+    assert tool._hedge_session.calls == 1
+    assert tool._session.calls == 1
+
+
+def test_async_hedge_cancels_primary_when_caller_is_cancelled():
+    tool = GoogleSearchTool(api_key="test-key", hedge_after=10)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    class HangingClient:
+        async def get(self, *args, **kwargs):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    async def run():
+        tool._ahedge_client = HangingClient()
+        search = asyncio.create_task(tool._hedged_get_async({}))
+        await started.wait()
+        search.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await search
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    asyncio.run(run())
@@ -0,0 +1,136 @@
+"""Tests for WebFetchTool."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from tools_for_agents import ToolExecutionError, WebFetchTool
+from tools_for_agents.tools.web_fetch import web_fetch_tool
+
+
+class FakeResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+
+    def __init__(
+        self,
+        body: bytes,
+        url: str = "https://example.com/",
+        content_type: str = "text/html; charset=utf-8"
+    ):
+        self.body = body
+        self.url = url
+        self.status_code = 200
+        self.headers = {"Content-Type": content_type}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+class FakeSession:
+    """Session that always returns the same page."""
+
+    def __init__(self, body: bytes, content_type: str = "text/html; charset=utf-8"):
+        self.body = body
+        self.content_type = content_type
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.body, url, self.content_type)
+
+
+def fetch(body: bytes, mode: str = "text", content_type: str = "text/html; charset=utf-8"):
+    tool = WebFetchTool()
+    tool._session = FakeSession(body, content_type)
+    return tool.validate_and_execute(url="https://example.com/", mode=mode)
+
+
+@pytest.mark.parametrize("body", [
+    b"<!DOCTYPE html><html><body><p>Hello</p></body></html>\n<!-- generated by CMS -->",
+    b"<!--[if lt IE 9]><script>shim()</script><![endif]--><html><body><p>Hello</p></body></html>",
+    b'<?xml version="1.0" encoding="utf-8"?>\n<html xmlns="http://www.w3.org/1999/xhtml">'
+    b"<body><p>Hello</p></body></html>",
+])
+def test_text_mode_handles_nodes_outside_root(body):
+    result = fetch(body)
+    assert result.content == "Hello"
+
+
+def test_text_mode_strips_non_content_elements():
+    result = fetch(
+        b"<html><head><title> Page </title><style>p {}</style></head><body>"
+        b"<nav>Menu</nav><p>First</p><!-- note --><p>  Second  </p>"
+        b"<script>track()</script><footer>Footer</footer></body></html>"
+    )
+    assert result.title == "Page"
+    assert result.content == "Page\nFirst\nSecond"
+
+
+@pytest.mark.parametrize("content_type", [
+    "Text/HTML", "TEXT/HTML; Charset=UTF-8", "Application/XHTML+XML", ""
+])
+def test_content_type_is_matched_case_insensitively(content_type):
+    assert fetch(b"<p>Hi</p>", content_type=content_type).content == "Hi"
+
+
+@pytest.mark.parametrize("content_type", [
+    "application/pdf", "Image/PNG", "APPLICATION/JSON; x=text/"
+])
+def test_unsupported_content_type_is_rejected(content_type):
+    with pytest.raises(ToolExecutionError, match="Unsupported content type"):
+        fetch(b"%PDF-1.7", content_type=content_type)
+
+
+@pytest.mark.parametrize("mode", ["text", "html"])
+@pytest.mark.parametrize("body", [b"", b"  \n", b"<!-- nothing here -->"])
+def test_empty_body_returns_empty_content(body, mode):
+    result = fetch(body, mode=mode)
+    assert result.content == ""
+    assert result.title is None
+
+
+def test_html_mode_keeps_the_page_doctype_and_outer_comments():
+    body = b"<!DOCTYPE html><html><body><p>Hi</p></body></html><!-- generated by CMS -->"
+    assert fetch(body, mode="html").content == (
+        "<!DOCTYPE html>\n<html><body><p>Hi</p></body></html><!-- generated by CMS -->"
+    )
+
+
+def test_html_mode_does_not_invent_a_doctype():
+    body = b"<!-- build 42 --><html><body><p>Hi</p></body></html>"
+    assert fetch(body, mode="html").content == (
+        "<!-- build 42 --><html><body><p>Hi</p></body></html>"
+    )
+
+
+def test_async_client_is_rebuilt_for_each_event_loop(monkeypatch):
+    clients = []
+
+    def create_async_client(**kwargs):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, html="<p>Hi</p>")
+        ))
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(web_fetch_tool, "create_async_client", create_async_client)
+    tool = WebFetchTool()
+
+    async def fetch_twice():
+        for _ in range(2):
+            result = await tool.validate_and_execute_async(url="https://example.com/")
+            assert result.content == "Hi"
+
+    # Each asyncio.run() is a new loop; calls within one loop share a client
+    asyncio.run(fetch_twice())
+    asyncio.run(fetch_twice())
+    assert len(clients) == 2
@@ -1,12 +1,53 @@
 """Web Fetch tool for retrieving web page content."""
 
+import asyncio
+import codecs
+import re
 from typing import Literal
+import httpx
+import orjson
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from pydantic import BaseModel, Field, HttpUrl
 
 from ...base import BaseTool
+from ...cache import ToolCache
 from ...exceptions import ToolExecutionError
+from ...session import create_async_client, create_session
+
+
+# Identifies our requests to the sites we fetch
+USER_AGENT = "Mozilla/5.0 (compatible; tools-for-agents/0.1.0;"
+
+# Content types we know how to parse (an empty header is given the benefit of the doubt)
+SUPPORTED_CONTENT_TYPES = ("text/", "application/xhtml")
+
+# Size of each chunk read from the response stream
+CHUNK_SIZE = 65536
+
+# Non-content elements dropped before extracting text
+NON_CONTENT_TAGS = [
+    "script", "style", "nav", "footer", "header", "noscript", "svg", "iframe"
+]
+
+# Finds every non-content element (and comment) in a single traversal
+NON_CONTENT_XPATH = etree.XPath(
+    "|".join([f"//{tag}" for tag in NON_CONTENT_TAGS] + ["//comment()"])
+)
+
+# Trims every line and drops blank ones in a single pass
+LINE_BREAK_RE = re.compile(r"\s*\n\s*")
+
+# Detects a doctype the page declared itself (libxml2 adds a default otherwise),
+# allowing a BOM, an XML declaration, and comments before it
+DOCTYPE_RE = re.compile(
+    rb"^(?:\xef\xbb\xbf)?\s*(?:<\?xml[^>]*>\s*)?(?:<!--.*?-->\s*)*<!doctype",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Pulls the charset out of a Content-Type header
+CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
 
 
 class WebFetchInput(BaseModel):
@@ -23,6 +64,12 @@ class WebFetchInput(BaseModel):
         le=120,
         description="Request timeout in seconds (5-120)"
     )
+    max_bytes: int = Field(
+        default=2_000_000,
+        ge=1024,
+        le=50_000_000,
+        description="Maximum bytes to download; larger pages are truncated (1KB-50MB)"
+    )
 
 
 class WebFetchOutput(BaseModel):
@@ -62,9 +109,24 @@ class WebFetchTool(BaseTool[WebFetchInput, WebFetchOutput]):
     input_model = WebFetchInput
     output_model = WebFetchOutput
 
-    def __init__(self):
-        """Initialize the Web Fetch tool."""
-        pass
+    def __init__(self, cache: ToolCache | None = None, ttl: int = 86400):
+        """
+        Initialize the Web Fetch tool.
+
+        Args:
+            cache: Optional cache for fetched pages. Cached pages are revalidated
+                with a conditional GET and reused when the server answers 304.
+            ttl: Seconds a cached page is kept (default: 1 day)
+        """
+        self.cache = cache
+        self.ttl = ttl
+        # Pooled session - keeps connections alive across many different hosts.
+        # Error statuses from arbitrary sites aren't retried, only failed connections.
+        self._session = create_session(pool_connections=32, retry_statuses=False)
+        # httpx clients can't be reused across event loops, so the async client
+        # is created on first use and rebuilt when the running loop changes
+        self._aclient: httpx.AsyncClient | None = None
+        self._aclient_loop: asyncio.AbstractEventLoop | None = None
 
     def execute(self, input: WebFetchInput) -> WebFetchOutput:
         """
@@ -79,47 +141,33 @@ class WebFetchTool(BaseTool[WebFetchInput, WebFetchOutput]):
         Raises:
             ToolExecutionError: If fetch fails or content is invalid
         """
-        try:
-            # Fetch the page
-            headers = {
-                "User-Agent": "Mozilla/5.0 (compatible; tools-for-agents/0.1.0;"
-            }
+        cache_key, cached = self._lookup(input)
 
-            response = requests.get(
+        try:
+            # Stream the body so we can stop at max_bytes
+            with self._session.get(
                 input.url,
-                headers=headers,
+                headers=self._headers(cached),
                 timeout=input.timeout,
+                stream=True,
                 allow_redirects=True
-            )
-            response.raise_for_status()
-
-            # Parse HTML
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract title
-            title_tag = soup.find("title")
-            title = title_tag.get_text(strip=True) if title_tag else None
-
-            # Get content based on mode
-            if input.mode == "html":
-                content = str(soup)
-            else:
-                # Remove scripts, styles, and other non-content elements
-                for element in soup(["script", "style", "nav", "footer", "header"]):
-                    element.decompose()
-
-                # Get text with reasonable formatting
-                content = soup.get_text(separator="\n", strip=True)
-
-                # Clean up excessive newlines
-                lines = [line.strip() for line in content.split("\n") if line.strip()]
-                content = "\n".join(lines)
-
-            return WebFetchOutput(
-                url=response.url,  # Final URL after redirects
-                content=content,
-                mode=input.mode,
-                title=title
+            ) as response:
+                response.raise_for_status()
+
+                if cached is not None and response.status_code == 304:
+                    return self._from_cache(cached, input.mode)
+
+                self._check_content_type(input.url, response.headers)
+
+                body = bytearray()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    body.extend(chunk)
+                    if len(body) >= input.max_bytes:
+                        del body[input.max_bytes:]
+                        break
+
+            return self._build_output(
+                input, bytes(body), response.url, response.headers, cache_key
             )
 
         except requests.HTTPError as e:
@@ -128,5 +176,220 @@ class WebFetchTool(BaseTool[WebFetchInput, WebFetchOutput]):
             ) from e
         except requests.RequestException as e:
             raise ToolExecutionError(f"Failed to fetch {input.url}: {e}") from e
+        except ToolExecutionError:
+            raise
         except Exception as e:
             raise ToolExecutionError(f"Error processing content: {e}") from e
+
+    async def execute_async(self, input: WebFetchInput) -> WebFetchOutput:
+        """
+        Fetch content from a URL without blocking the event loop.
+
+        Args:
+            input: Validated fetch parameters
+
+        Returns:
+            Page content as text or HTML
+
+        Raises:
+            ToolExecutionError: If fetch fails or content is invalid
+        """
+        cache_key, cached = self._lookup(input)
+
+        try:
+            # Stream the body so we can stop at max_bytes
+            async with self._async_client().stream(
+                "GET",
+                input.url,
+                headers=self._headers(cached),
+                timeout=input.timeout
+            ) as response:
+                # httpx treats 304 as an error status, so check it first
+                if cached is not None and response.status_code == 304:
+                    return self._from_cache(cached, input.mode)
+
+                response.raise_for_status()
+                self._check_content_type(input.url, response.headers)
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    body.extend(chunk)
+                    if len(body) >= input.max_bytes:
+                        del body[input.max_bytes:]
+                        break
+
+            # Parsing is CPU-bound - run it in a thread so other fetches keep going
+            return await asyncio.to_thread(
+                self._build_output,
+                input, bytes(body), str(response.url), response.headers, cache_key
+            )
+
+        except httpx.HTTPStatusError as e:
+            raise ToolExecutionError(
+                f"HTTP error fetching {input.url}: {e.response.status_code}"
+            ) from e
+        except httpx.HTTPError as e:
+            raise ToolExecutionError(f"Failed to fetch {input.url}: {e}") from e
+        except ToolExecutionError:
+            raise
+        except Exception as e:
+            raise ToolExecutionError(f"Error processing content: {e}") from e
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was opened on the running event loop."""
+        if self._aclient is not None and self._aclient_loop is asyncio.get_running_loop():
+            await self._aclient.aclose()
+        self._aclient = None
+        self._aclient_loop = None
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """Return the async client for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            # A client from an earlier loop can't be closed from this one - drop it
+            self._aclient = create_async_client(retry_statuses=False)
+            self._aclient_loop = loop
+        return self._aclient
+
+    def _lookup(self, input: WebFetchInput) -> tuple[str | None, dict | None]:
+        """Return the cache key for this URL and the cached entry, if any."""
+        if self.cache is None:
+            return None, None
+
+        cache_key = ToolCache.make_key(
+            self.name,
+            url=input.url,
+            max_bytes=input.max_bytes
+        )
+        entry = self.cache.get(cache_key)
+        return cache_key, orjson.loads(entry) if entry is not None else None
+
+    def _headers(self, cached: dict | None) -> dict:
+        """Build request headers, revalidating a cached copy when we have one."""
+        headers = {"User-Agent": USER_AGENT}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def _from_cache(self, cached: dict, mode: str) -> WebFetchOutput:
+        """Rebuild an output from a cached entry."""
+        return WebFetchOutput(
+            url=cached["url"],
+            content=cached["content"][mode],
+            mode=mode,
+            title=cached["title"]
+        )
+
+    def _check_content_type(self, url: str, headers) -> None:
+        """Reject responses we can't parse before downloading the body."""
+        content_type = headers.get("Content-Type", "")
+        # Media types are case-insensitive; parameters like charset don't matter here
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        if media_type and not media_type.startswith(SUPPORTED_CONTENT_TYPES):
+            raise ToolExecutionError(
+                f"Unsupported content type for {url}: {content_type}"
+            )
+
+    def _parser(self, body: bytes, headers) -> lxml.html.HTMLParser:
+        """
+        Pick an HTML parser for the page's encoding.
+
+        We use the charset from Content-Type when there is one, then UTF-8 if
+        the body decodes cleanly, and otherwise let libxml2 read <meta charset>.
+        """
+        match = CHARSET_RE.search(headers.get("Content-Type", ""))
+        encoding = match.group(1) if match else None
+        if encoding is None:
+            try:
+                # Incremental decode tolerates a character cut off at max_bytes
+                codecs.getincrementaldecoder("utf-8")().decode(body)
+                encoding = "utf-8"
+            except UnicodeDecodeError:
+                pass
+
+        try:
+            return lxml.html.HTMLParser(encoding=encoding)
+        except LookupError:
+            # Unknown charset name - fall back to libxml2's detection
+            return lxml.html.HTMLParser()
+
+    def _serialize(self, tree: lxml.html.HtmlElement, body: bytes) -> str:
+        """
+        Serialize a parsed page as HTML.
+
+        Keeps comments and processing instructions outside <html>, and only
+        emits a doctype when the page declared one.
+        """
+        parts = []
+        if DOCTYPE_RE.match(body):
+            parts.append(tree.getroottree().docinfo.doctype + "\n")
+        before = reversed(list(tree.itersiblings(preceding=True)))
+        for node in [*before, tree, *tree.itersiblings()]:
+            parts.append(lxml.html.tostring(node, encoding="unicode"))
+        return "".join(parts)
+
+    def _build_output(
+        self,
+        input: WebFetchInput,
+        body: bytes,
+        url: str,
+        headers,
+        cache_key: str | None
+    ) -> WebFetchOutput:
+        """Parse a downloaded page and cache it when the server sent validators."""
+        # Parse HTML
+        try:
+            tree = lxml.html.document_fromstring(body, parser=self._parser(body, headers))
+        except etree.ParserError:
+            # Empty body (or no markup at all) - nothing to extract
+            tree = None
+
+        # Extract title
+        title = tree.findtext(".//title") if tree is not None else None
+        title = title.strip() if title is not None else None
+
+        # Build both modes when caching, so a 304 can answer either mode
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        store = cache_key is not None and (etag or last_modified)
+        contents = {}
+
+        # Get content based on mode
+        if tree is None:
+            contents = {"html": "", "text": ""}
+        if tree is not None and (input.mode == "html" or store):
+            contents["html"] = self._serialize(tree, body)
+        if tree is not None and (input.mode == "text" or store):
+            # Remove non-content elements in one XPath pass. drop_tree keeps the
+            # text that follows each element, unlike a plain remove().
+            for element in NON_CONTENT_XPATH(tree):
+                # Comments and PIs outside <html> have no parent to drop from
+                if element.getparent() is not None:
+                    element.drop_tree()
+
+            # Join text nodes, then trim lines and drop blank ones in one pass
+            content = "\n".join(tree.itertext())
+            contents["text"] = LINE_BREAK_RE.sub("\n", content).strip()
+
+        if store:
+            self.cache.set(
+                cache_key,
+                orjson.dumps({
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "url": url,
+                    "title": title,
+                    "content": contents
+                }).decode(),
+                ttl=self.ttl
+            )
+
+        return WebFetchOutput(
+            url=url,  # Final URL after redirects
+            content=contents[input.mode],
+            mode=input.mode,
+            title=title
+        )